@@ -10,8 +10,8 @@ import asyncio
 
 from dateutil import parser as dateutil_parser
 from powens import PowensClient
+import firefly_iii_client
 from firefly_iii_client.configuration import Configuration
-import dateutil
 
 from powens_firefly.handling import handle_credentials, handle_banks, list_all_accounts, handle_mapping
 from powens_firefly.process import process_all_transactions
@@ -60,13 +60,13 @@ def arg_parser() -> argparse.ArgumentParser:
 
     parser.add_argument(
         "--min-date",
-        type=dateutil.parser.parse,
+        type=dateutil_parser.parse,
         help="Minimum date for transactions.",
     )
 
     parser.add_argument(
         "--max-date",
-        type=dateutil.parser.parse,
+        type=dateutil_parser.parse,
         help="Maximum date for transactions.",
     )
 
@@ -141,6 +141,9 @@ def main(input_args: list | None = None) -> None:
         host=credentials.firefly.url,
         access_token=credentials.firefly.token,
     )
+    # Let urllib3 retry transient failures on the pooled connection
+    # instead of bubbling them up and tearing the client down.
+    firefly_configuration.retries = 3
 
     if not args.auto:
         print("\n--- Configuration ---")
@@ -149,16 +152,25 @@ def main(input_args: list | None = None) -> None:
             powens_client=powens_client,
             credentials=credentials
         )
+
+    # Fetch the account lists once; the configuration steps and the
+    # transaction processing all work from the same snapshot.
+    powens_accounts = loop.run_until_complete(powens_client.accounts.list_all(
+        user_id=credentials.powens.user_id,
+    )).accounts
+
+    if not args.auto:
+        with firefly_iii_client.ApiClient(firefly_configuration) as api_client:
+            api_instance = firefly_iii_client.AutocompleteApi(api_client)
+            firefly_accounts = api_instance.get_accounts_ac()
+
         list_all_accounts(
-            loop=loop,
-            powens_client=powens_client,
-            firefly_configuration=firefly_configuration,
-            credentials=credentials,
+            powens_accounts=powens_accounts,
+            firefly_accounts=firefly_accounts,
         )
         handle_mapping(
-            loop=loop,
-            powens_client=powens_client,
-            firefly_configuration=firefly_configuration,
+            powens_accounts=powens_accounts,
+            firefly_accounts=firefly_accounts,
             credentials=credentials,
         )
         credentials.save(args.credentials_path)
@@ -168,6 +180,7 @@ def main(input_args: list | None = None) -> None:
         loop=loop,
         powens_client=powens_client,
         firefly_configuration=firefly_configuration,
+        powens_accounts=powens_accounts,
         limit=args.transaction_limit,
         min_date=args.min_date,
         max_date=args.max_date,
@@ -2,17 +2,23 @@
 Class to store credentials
 """
 import logging
+from dataclasses import asdict
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 from pydantic.dataclasses import dataclass
 
 import yaml
+try:
+    # libyaml bindings, much faster than the pure-Python parser/emitter
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class PowensCredentials:
     domain: str
     client_id: str
@@ -38,14 +44,14 @@ class FireflyTokenType(Enum):
         return f"<FireflyTokenType {self.value}>"
 
 
-@dataclass
+@dataclass(slots=True)
 class FireflyCredentials:
     url: str
     token: str
     token_type: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Credentials:
     powens: PowensCredentials
     firefly: FireflyCredentials
@@ -55,18 +61,20 @@ class Credentials:
         with file_path.open("w") as f:
             yaml.dump(
                 data={
-                    "powens": self.powens.__dict__,
-                    "firefly": self.firefly.__dict__,
+                    "powens": asdict(self.powens),
+                    "firefly": asdict(self.firefly),
                     "mapping": self.mapping,
                 },
                 stream=f,
+                Dumper=SafeDumper,
+                sort_keys=False,
             )
 
     @staticmethod
     def load(file_path: Path) -> "Credentials":
 
         with file_path.open("r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=SafeLoader)
 
         return Credentials(
             powens=PowensCredentials(**data["powens"]),
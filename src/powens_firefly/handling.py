@@ -9,11 +9,14 @@ from datetime import datetime, timezone
 
 from powens import PowensClient
 from powens.models.account import BankAccount
-import firefly_iii_client
 from firefly_iii_client.models.autocomplete_account import AutocompleteAccount
 
 from powens_firefly.credentials import Credentials, PowensCredentials, FireflyCredentials, FireflyTokenType
 
+# Affirmative replies accepted by the interactive prompts
+_YES = frozenset({"yes", "y", "1"})
+_YES_SHORT = frozenset({"y", "yes"})
+
 
 def handle_credentials(credentials_path: Path, auto: bool) -> Credentials:
     """
@@ -31,7 +34,7 @@ def handle_credentials(credentials_path: Path, auto: bool) -> Credentials:
         if auto:
             raise FileNotFoundError(f"Mode auto activated but no config file was found at '{credentials_path}'")
         reply = input("Couldn't find credentials file, setup it up ? ([y]/n) ")
-        if reply.lower() not in ("yes", "y", "1", ""):
+        if reply.lower() not in _YES and reply != "":
             raise SystemExit(1)
 
         powens_domain = input("POWENS DOMAIN: ").strip()
@@ -101,7 +104,7 @@ def handle_banks(loop: AbstractEventLoop, powens_client: PowensClient, credentia
             print("You currently have NO BANKS connected to Powens")
 
         reply = input(f"Add a bank connection ? ({'y / [n]' if powens_banks.connections else '[y] / n'}) ").strip()
-        if reply.lower() in ("yes", "y", "1") or (not powens_banks.connections and reply == ""):
+        if reply.lower() in _YES or (not powens_banks.connections and reply == ""):
 
             auth_code = loop.run_until_complete(powens_client.auth.generate_code())
 
@@ -120,85 +123,61 @@ def handle_banks(loop: AbstractEventLoop, powens_client: PowensClient, credentia
 
 
 def list_all_accounts(
-        loop: AbstractEventLoop,
-        powens_client: PowensClient,
-        firefly_configuration: firefly_iii_client.configuration.Configuration,
-        credentials: Credentials,
+        powens_accounts: list[BankAccount],
+        firefly_accounts: list[AutocompleteAccount],
 ) -> None:
     print("\n--- Powens Accounts ---")
-    powens_accounts = loop.run_until_complete(powens_client.accounts.list_all(
-        user_id=credentials.powens.user_id,
-    ))
-
-    for powens_account in powens_accounts.accounts:
+    for powens_account in powens_accounts:
         print(f"{powens_account.id} {powens_account.name} {powens_account.type} "
               f"{powens_account.currency.id} {powens_account.iban}")
 
     print("\n--- Firefly-III Accounts ---")
-    with firefly_iii_client.ApiClient(firefly_configuration) as api_client:
-        api_instance = firefly_iii_client.AutocompleteApi(api_client)
-        firefly_accounts = api_instance.get_accounts_ac()
-
     for firefly_account in firefly_accounts:
         print(f"{firefly_account.id} {firefly_account.name} {firefly_account.type} "
               f"{firefly_account.currency_name}")
 
 
-def find_account_by_id(
-        id: int,
-        accounts: list[BankAccount | AutocompleteAccount]
-) -> BankAccount | AutocompleteAccount | None:
-    for account in accounts:
-        if int(account.id) == id:  # Force to be int since AutocompleteAccount.id is a string
-            return account
-    return None
-
-
 def handle_mapping(
-        loop: AbstractEventLoop,
-        powens_client: PowensClient,
-        firefly_configuration: firefly_iii_client.configuration.Configuration,
-        credentials: Credentials
+        powens_accounts: list[BankAccount],
+        firefly_accounts: list[AutocompleteAccount],
+        credentials: Credentials,
 ) -> None:
 
-    powens_accounts = loop.run_until_complete(powens_client.accounts.list_all(
-        user_id=credentials.powens.user_id,
-    ))
-
-    with firefly_iii_client.ApiClient(firefly_configuration) as api_client:
-        api_instance = firefly_iii_client.AutocompleteApi(api_client)
-        firefly_accounts = api_instance.get_accounts_ac()
+    # Index both lists once instead of scanning them per mapping entry
+    # (force ids to int since AutocompleteAccount.id is a string)
+    powens_by_id = {int(account.id): account for account in powens_accounts}
+    firefly_by_id = {int(account.id): account for account in firefly_accounts}
 
     for powens_id, firefly_id in credentials.mapping.items():
-        powens_account = find_account_by_id(powens_id, powens_accounts.accounts)
-        firefly_account = find_account_by_id(firefly_id, firefly_accounts)
+        powens_account = powens_by_id.get(powens_id)
+        firefly_account = firefly_by_id.get(firefly_id)
 
         if powens_account is None:
             reply = input(f"No Powens account found for id={powens_id} "
                           f"(firefly linked id={firefly_id}), remove ? (y/[n]) ").strip()
-            if reply.lower() in ("y", "yes"):
+            if reply.lower() in _YES_SHORT:
                 credentials.mapping.pop(powens_id)
             continue
 
         if firefly_account is None:
             reply = input(f"No Firefly account found for id={firefly_id} "
                           f"(powens linked id={powens_id}), remove ? (y/[n]) ").strip()
-            if reply.lower() in ("y", "yes"):
+            if reply.lower() in _YES_SHORT:
                 credentials.mapping.pop(firefly_id)
             continue
 
-    def resolve_name(account_id, accounts, finder):
-        account = finder(account_id, accounts)
+    def resolve_name(account_id, accounts_by_id):
+        account = accounts_by_id.get(account_id)
         return f"{account_id}. {account.name if account else '??????'}"
 
     print(f"\n--- Mapping Links ({len(credentials.mapping)}) ---")
 
     powens_lines = [
-        resolve_name(pid, powens_accounts.accounts, find_account_by_id)
+        resolve_name(pid, powens_by_id)
         for pid in credentials.mapping
     ]
     firefly_lines = [
-        resolve_name(fid, firefly_accounts, find_account_by_id)
+        resolve_name(fid, firefly_by_id)
         for fid in credentials.mapping.values()
     ]
 
@@ -212,5 +191,5 @@ def handle_mapping(
         print(f"{p:<{max_p}} -> {f:<{max_f}}")
 
     reply = input("\nAre these mappings adequate ? (if not exits) (y/[n])").strip()
-    if reply.lower() not in ("y", "yes"):
+    if reply.lower() not in _YES_SHORT:
         raise SystemExit(1)
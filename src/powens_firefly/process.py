@@ -1,7 +1,7 @@
 """
 Processing functions to detect and convert powens transactions into Firefly-III transactions.
 """
-from datetime import datetime, time
+from datetime import date, datetime, time
 from dataclasses import dataclass
 from asyncio.events import AbstractEventLoop
 from decimal import Decimal
@@ -21,7 +21,7 @@ from powens_firefly.credentials import Credentials
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class FoundTransactionTransfer:
     origin_transaction: Transaction
     counterparty_transaction: Transaction
@@ -30,7 +30,7 @@ class FoundTransactionTransfer:
     counterparty_transactions_index: int
 
 
-@dataclass()
+@dataclass(slots=True)
 class CommonFireflyTransfer:
     origin_id: int
     counterparty_id: int
@@ -104,34 +104,63 @@ def same_sign(a: Decimal, b: Decimal) -> bool:
     return (a >= 0) == (b >= 0)
 
 
+def group_transactions_by_account_date(transactions: list[Transaction]) -> dict[tuple[int, date], list[int]]:
+    """
+    Index transaction positions by (account id, rdate) so finders only probe same-day candidates.
+
+    rdate is the date component of rdatetime when the latter is present,
+    so a record-date match always falls inside the probed bucket.
+    """
+    buckets: dict[tuple[int, date], list[int]] = {}
+    for index, transaction in enumerate(transactions):
+        buckets.setdefault((transaction.id_account, transaction.rdate), []).append(index)
+    return buckets
+
+
+def match_record_dates(transaction: Transaction, iter_transaction: Transaction) -> bool:
+    """Match on rdatetime when both sides carry one, otherwise fall back to rdate."""
+    if iter_transaction.rdatetime is not None and transaction.rdatetime is not None:
+        return iter_transaction.rdatetime == transaction.rdatetime
+    return (
+        iter_transaction.rdate is not None and
+        transaction.rdate is not None and
+        iter_transaction.rdate == transaction.rdate
+    )
+
+
 def find_transaction_endpoint(
         transaction: Transaction,
         transactions: list[Transaction],
+        transactions_by_account_date: dict[tuple[int, date], list[int]],
         accounts: dict[int, BankAccount],
+        accounts_by_iban: dict[str, BankAccount],
+        processed_indexes: set[int],
 ) -> FoundTransactionTransfer | None:
-    if transaction.counterparty is None:
+    counterparty = transaction.counterparty
+    if counterparty is None:
         return None
 
     account = accounts[transaction.id_account]
-    counterparty_account = None
-    for search_account in accounts.values():
-        if search_account.iban is not None and transaction.counterparty.account_identification == search_account.iban:
-            counterparty_account = search_account
-            break
-    else:
+    counterparty_account = accounts_by_iban.get(counterparty.account_identification)
+    if counterparty_account is None:
+        return None
+
+    if counterparty_account.id == account.id:  # Self-transfer, nothing to pair
+        return None
+
+    if account.currency.id != counterparty_account.currency.id:
         return None
 
     no_commission_value = transaction.value
     if transaction.commission is not None:
         no_commission_value += float(transaction.commission)
+    no_commission_abs = abs(no_commission_value)
 
-    for index, iter_transaction in enumerate(transactions):
-
-        if iter_transaction == transaction:
+    for index in transactions_by_account_date.get((counterparty_account.id, transaction.rdate), ()):
+        if index in processed_indexes:
             continue
 
-        if iter_transaction.id_account != counterparty_account.id:
-            continue
+        iter_transaction = transactions[index]
 
         iter_no_commission_value = iter_transaction.value
         if iter_transaction.commission is not None:
@@ -139,23 +168,11 @@ def find_transaction_endpoint(
 
         if (
                 same_sign(no_commission_value, iter_no_commission_value) or
-                account.currency.id != counterparty_account.currency.id or
-                abs(no_commission_value) != abs(iter_no_commission_value)
+                no_commission_abs != abs(iter_no_commission_value)
         ):
             continue
 
-        compare_datetime = iter_transaction.rdatetime is not None and transaction.rdatetime is not None
-        if compare_datetime and iter_transaction.rdatetime == transaction.rdatetime:
-            return FoundTransactionTransfer(
-                origin_transaction=transaction,
-                counterparty_transaction=iter_transaction,
-                origin_account=account,
-                counterparty_account=counterparty_account,
-                counterparty_transactions_index=index,
-            )
-
-        compare_date = iter_transaction.rdate is not None and transaction.rdate is not None
-        if not compare_datetime and compare_date and iter_transaction.rdate == transaction.rdate:
+        if match_record_dates(transaction, iter_transaction):
             return FoundTransactionTransfer(
                 origin_transaction=transaction,
                 counterparty_transaction=iter_transaction,
@@ -174,26 +191,28 @@ def print_powens_transaction(
     if transaction.rdate is None:
         raise ValueError(f"{transaction} has no rdate")
 
-    print(f"\twording: {transaction.wording}")
-
-    print(f"\tid_account: {transaction.id_account}")
     powens_account = accounts[transaction.id_account]
-    print(f"\taccount name: {powens_account.name}")
-    print(f"\taccount iban: {powens_account.iban}")
-
-    # print(f"\tapplication_date: {transaction.application_date}")  # same as rdate
-    print(f"\tvdate: {transaction.vdate}")
-    print(f"\tvdatetime: {transaction.vdatetime}")
-    print(f"\trdate: {transaction.rdate}")
-    print(f"\trdatetime: {transaction.rdatetime}")
 
-    print(f"\tcounterparty: {transaction.counterparty}")
-
-    print(f"\tvalue: {transaction.value}")
-    print(f"\toriginal_value: {transaction.original_value}")  # Not used
-    print(f"\toriginal_currency: {transaction.original_currency}")  # Not used
-    print(f"\tcommission: {transaction.commission}")  # informative, don't add on to the value, already counted
-    print(f"\tcommission_currency: {transaction.commission_currency}")  # Not used
+    # Build the whole block and write it in one call rather than one print per field
+    # (application_date is omitted, same as rdate;
+    #  original_value/original_currency/commission_currency not used;
+    #  commission is informative, don't add on to the value, already counted)
+    print(
+        f"\twording: {transaction.wording}\n"
+        f"\tid_account: {transaction.id_account}\n"
+        f"\taccount name: {powens_account.name}\n"
+        f"\taccount iban: {powens_account.iban}\n"
+        f"\tvdate: {transaction.vdate}\n"
+        f"\tvdatetime: {transaction.vdatetime}\n"
+        f"\trdate: {transaction.rdate}\n"
+        f"\trdatetime: {transaction.rdatetime}\n"
+        f"\tcounterparty: {transaction.counterparty}\n"
+        f"\tvalue: {transaction.value}\n"
+        f"\toriginal_value: {transaction.original_value}\n"
+        f"\toriginal_currency: {transaction.original_currency}\n"
+        f"\tcommission: {transaction.commission}\n"
+        f"\tcommission_currency: {transaction.commission_currency}"
+    )
 
 
 def get_most_precise_datetime2(
@@ -227,12 +246,18 @@ def process_transfers(
     Find all the Transfers using counterparty iban, value without commission and date
     """
     output_transactions: list[TransactionSplitStore] = []
-    processed_transactions_indexes: list[int] = []
+    processed_transactions_indexes: set[int] = set()
 
-    initial_transactions = transactions.copy()
+    # Index accounts by IBAN once so counterparty resolution is a dict lookup
+    accounts_by_iban = {
+        account.iban: account
+        for account in accounts.values()
+        if account.iban is not None
+    }
+    transactions_by_account_date = group_transactions_by_account_date(transactions)
 
     print("\n--- Detecting Transfers ---")
-    for index, transaction in enumerate(initial_transactions):
+    for index, transaction in enumerate(transactions):
 
         if transaction.counterparty is None:
             continue
@@ -243,18 +268,19 @@ def process_transfers(
         ftt = find_transaction_endpoint(  # found_transaction_transfer (ftt)
             transaction=transaction,
             transactions=transactions,
+            transactions_by_account_date=transactions_by_account_date,
             accounts=accounts,
+            accounts_by_iban=accounts_by_iban,
+            processed_indexes=processed_transactions_indexes,
         )
 
         if ftt is None:
             continue
 
-        processed_transactions_indexes.extend([
+        processed_transactions_indexes.update((
             index,
             ftt.counterparty_transactions_index,
-        ])
-        transactions.remove(transaction)
-        transactions.remove(ftt.counterparty_transaction)
+        ))
 
         print(f"{'-' * 50}")
         print_powens_transaction(ftt.origin_transaction, accounts=accounts)
@@ -280,7 +306,12 @@ def process_transfers(
             )
         )
 
-    return output_transactions, transactions
+    remaining_transactions = [
+        transaction
+        for index, transaction in enumerate(transactions)
+        if index not in processed_transactions_indexes
+    ]
+    return output_transactions, remaining_transactions
 
 
 # REVOLUT EXCHANGES ----------------------------------------------------------------------------------------------------
@@ -289,28 +320,20 @@ def process_transfers(
 def find_exchange_endpoint(
         transaction: Transaction,
         transactions: list[Transaction],
+        transactions_by_account_date: dict[tuple[int, date], list[int]],
         account: BankAccount,
         counterparty_account: BankAccount,
+        processed_indexes: set[int],
 ) -> FoundTransactionTransfer | None:
     """"""
 
-    for index, iter_transaction in enumerate(transactions):
-
-        if iter_transaction.id_account != counterparty_account.id:
+    for index in transactions_by_account_date.get((counterparty_account.id, transaction.rdate), ()):
+        if index in processed_indexes:
             continue
 
-        compare_datetime = iter_transaction.rdatetime is not None and transaction.rdatetime is not None
-        if compare_datetime and iter_transaction.rdatetime == transaction.rdatetime:
-            return FoundTransactionTransfer(
-                origin_transaction=transaction,
-                counterparty_transaction=iter_transaction,
-                origin_account=account,
-                counterparty_account=counterparty_account,
-                counterparty_transactions_index=index,
-            )
+        iter_transaction = transactions[index]
 
-        compare_date = iter_transaction.rdate is not None and transaction.rdate is not None
-        if not compare_datetime and compare_date and iter_transaction.rdate == transaction.rdate:
+        if match_record_dates(transaction, iter_transaction):
             return FoundTransactionTransfer(
                 origin_transaction=transaction,
                 counterparty_transaction=iter_transaction,
@@ -322,8 +345,11 @@ def find_exchange_endpoint(
     return None
 
 
+_CURRENCY_PATTERN = re.compile(r'\b(?:to|in|into|from|for)\s+([A-Z]{3})\b')
+
+
 def extract_currency(text: str):
-    match = re.search(r'\b(?:to|in|into|from|for)\s+([A-Z]{3})\b', text)
+    match = _CURRENCY_PATTERN.search(text)
     return match.group(1) if match else None
 
 
@@ -347,50 +373,52 @@ def process_revolut_exchanges(
         for account in accounts.values()
         if "revolut" in account.name.lower() and account.id_type == 2  # id_type = 2 = checking account
     }
-    revolut_accounts_id_list: list[BankAccount] = [rev_account.id for rev_account in revolut_accounts.values()]
+    revolut_account_ids: frozenset[int] = frozenset(
+        rev_account.id for rev_account in revolut_accounts.values()
+    )
 
-    if len(revolut_accounts_id_list) < 2:
+    if len(revolut_account_ids) < 2:
         return [], transactions
 
     output_transactions: list[TransactionSplitStore] = []
-    processed_transactions_indexes: list[int] = []
+    processed_transactions_indexes: set[int] = set()
 
-    initial_transactions = transactions.copy()
+    transactions_by_account_date = group_transactions_by_account_date(transactions)
 
     print("\n--- Detecting Revolut Exchanges ---")
-    for index, transaction in enumerate(initial_transactions):
+    for index, transaction in enumerate(transactions):
 
-        if transaction.id_account not in revolut_accounts_id_list:
+        if transaction.id_account not in revolut_account_ids:
             continue
 
         if index in processed_transactions_indexes:
             continue
 
-        if "exchange" not in transaction.wording.lower():
+        wording = transaction.wording
+        if "exchange" not in wording.lower():
             continue
 
         current_account = accounts[transaction.id_account]
-        currency_type = extract_currency(transaction.wording)
+        currency_type = extract_currency(wording)
         if currency_type == current_account.currency.id:  # Can only find the 'from' when on its transfer
             continue
 
         fre = find_exchange_endpoint(  # found_revolut_exchange (fre)
             transaction=transaction,
             transactions=transactions,
+            transactions_by_account_date=transactions_by_account_date,
             account=current_account,
             counterparty_account=revolut_accounts[currency_type],
+            processed_indexes=processed_transactions_indexes,
         )
 
         if fre is None:
             continue
 
-        processed_transactions_indexes.extend([
+        processed_transactions_indexes.update((
             index,
             fre.counterparty_transactions_index,
-        ])
-
-        transactions.remove(fre.origin_transaction)
-        transactions.remove(fre.counterparty_transaction)
+        ))
 
         print(f"{'-' * 50}")
         print_powens_transaction(fre.origin_transaction, accounts=accounts)
@@ -419,7 +447,12 @@ def process_revolut_exchanges(
             )
         )
 
-    return output_transactions, transactions
+    remaining_transactions = [
+        transaction
+        for index, transaction in enumerate(transactions)
+        if index not in processed_transactions_indexes
+    ]
+    return output_transactions, remaining_transactions
 
 
 # CREDIT-AGRICOLE TRANSFERS --------------------------------------------------------------------------------------------
@@ -429,38 +462,36 @@ def process_revolut_exchanges(
 def find_ca_endpoint(
         transaction: Transaction,
         transactions: list[Transaction],
+        transactions_by_account_date: dict[tuple[int, date], list[int]],
         account: BankAccount,
         accounts: dict[int, BankAccount],
-        allowed_account_ids: list[int],
+        allowed_account_ids: tuple[int, ...],
+        processed_indexes: set[int],
 ) -> FoundTransactionTransfer | None:
     """"""
 
-    for index, iter_transaction in enumerate(transactions):
+    transaction_value = transaction.value
+    transaction_abs = abs(transaction_value)
 
-        if iter_transaction.id_account == transaction.id_account:  # Same as initial account, skip
+    candidate_indexes = (
+        index
+        for account_id in allowed_account_ids
+        if account_id != transaction.id_account  # Same as initial account, skip
+        for index in transactions_by_account_date.get((account_id, transaction.rdate), ())
+    )
+    for index in candidate_indexes:
+        if index in processed_indexes:
             continue
 
-        if iter_transaction.id_account not in allowed_account_ids:  # Not Credit-agricole account skip
-            continue
+        iter_transaction = transactions[index]
 
-        if same_sign(iter_transaction.value, transaction.value):  # From one to the other
+        if same_sign(iter_transaction.value, transaction_value):  # From one to the other
             continue
 
-        if abs(iter_transaction.value) != abs(transaction.value):  # Assumed no fees for Credit-Agricole transfers
+        if abs(iter_transaction.value) != transaction_abs:  # Assumed no fees for Credit-Agricole transfers
             continue
 
-        compare_datetime = iter_transaction.rdatetime is not None and transaction.rdatetime is not None
-        if compare_datetime and iter_transaction.rdatetime == transaction.rdatetime:
-            return FoundTransactionTransfer(
-                origin_transaction=transaction,
-                counterparty_transaction=iter_transaction,
-                origin_account=account,
-                counterparty_account=accounts[iter_transaction.id_account],
-                counterparty_transactions_index=index,
-            )
-
-        compare_date = iter_transaction.rdate is not None and transaction.rdate is not None
-        if not compare_datetime and compare_date and iter_transaction.rdate == transaction.rdate:
+        if match_record_dates(transaction, iter_transaction):
             return FoundTransactionTransfer(
                 origin_transaction=transaction,
                 counterparty_transaction=iter_transaction,
@@ -497,20 +528,22 @@ def process_credit_agricole(
         for account in accounts.values()
         if account.id_connection == compte_cheque.id_connection  # Same connection as COMPTE CHEQUE
     }
-    ca_accounts_id_list: list[BankAccount] = [ca_account.id for ca_account in ca_accounts.values()]
+    # Tuple for the finder's ordered iteration, frozenset for the per-transaction membership check
+    ca_account_ids: tuple[int, ...] = tuple(ca_accounts)
+    ca_account_ids_set: frozenset[int] = frozenset(ca_account_ids)
 
-    if len(ca_accounts_id_list) < 2:
+    if len(ca_account_ids) < 2:
         return [], transactions
 
     output_transactions: list[TransactionSplitStore] = []
-    processed_transactions_indexes: list[int] = []
+    processed_transactions_indexes: set[int] = set()
 
-    initial_transactions = transactions.copy()
+    transactions_by_account_date = group_transactions_by_account_date(transactions)
 
     print("\n--- Detecting Credit-Agricole Transfers ---")
-    for index, transaction in enumerate(initial_transactions):
+    for index, transaction in enumerate(transactions):
 
-        if transaction.id_account not in ca_accounts_id_list:
+        if transaction.id_account not in ca_account_ids_set:
             continue
 
         if index in processed_transactions_indexes:
@@ -523,21 +556,20 @@ def process_credit_agricole(
         fcat = find_ca_endpoint(  # found_ca_transfer (fcat)
             transaction=transaction,
             transactions=transactions,
+            transactions_by_account_date=transactions_by_account_date,
             account=current_account,
             accounts=accounts,
-            allowed_account_ids=ca_accounts_id_list,
+            allowed_account_ids=ca_account_ids,
+            processed_indexes=processed_transactions_indexes,
         )
 
         if fcat is None:
             continue
 
-        processed_transactions_indexes.extend([
+        processed_transactions_indexes.update((
             index,
             fcat.counterparty_transactions_index,
-        ])
-
-        transactions.remove(fcat.origin_transaction)
-        transactions.remove(fcat.counterparty_transaction)
+        ))
 
         print(f"{'-' * 50}")
         print_powens_transaction(fcat.origin_transaction, accounts=accounts)
@@ -563,7 +595,12 @@ def process_credit_agricole(
             )
         )
 
-    return output_transactions, transactions
+    remaining_transactions = [
+        transaction
+        for index, transaction in enumerate(transactions)
+        if index not in processed_transactions_indexes
+    ]
+    return output_transactions, remaining_transactions
 
 
 # REMAINING TRANSACTIONS -----------------------------------------------------------------------------------------------
@@ -637,6 +674,7 @@ def process_all_transactions(
         loop: AbstractEventLoop,
         powens_client: PowensClient,
         firefly_configuration: Configuration,
+        powens_accounts: list[BankAccount],
         limit: int = 1000,
         min_date: datetime = None,
         max_date: datetime = None,
@@ -645,13 +683,10 @@ def process_all_transactions(
     """
     Main method to process all types of transactions from powens and convert them into Firefly-III transactions.
     """
-    powens_accounts = loop.run_until_complete(powens_client.accounts.list_all(
-        user_id=credentials.powens.user_id,
-    )).accounts
     powens_accounts_dict = {
         powens_account.id: powens_account
         for powens_account in powens_accounts
-        if powens_account.id in credentials.mapping.keys()
+        if powens_account.id in credentials.mapping
     }
 
     # Getting Firefly Currency ids i.e. 'EUR': 1, 'GBP': x ...
@@ -679,7 +714,7 @@ def process_all_transactions(
         for t in powens_transactions
         if (
                 t.vdate is not None and
-                t.id_account in credentials.mapping.keys()
+                t.id_account in credentials.mapping
         )
     ]
 
@@ -13,17 +13,20 @@ def upload_transactions(
 ):
     print("\nUploading transactions to Firefly-III\n")
 
-    for transaction in transactions:
-        print(f"Sending {transaction.description} {transaction.amount} ... ", end="")
+    # Single client for the whole batch so the underlying connection is reused
+    # between uploads instead of re-established per transaction.
+    with firefly_iii_client.ApiClient(firefly_configuration) as api_client:
+        api_instance = firefly_iii_client.TransactionsApi(api_client)
 
-        transaction_store = firefly_iii_client.TransactionStore(
-            apply_rules=True,
-            error_if_duplicate_hash=False,
-            transactions=[transaction],
-        )
+        for transaction in transactions:
+            print(f"Sending {transaction.description} {transaction.amount} ... ", end="")
+
+            transaction_store = firefly_iii_client.TransactionStore(
+                apply_rules=True,
+                error_if_duplicate_hash=False,
+                transactions=[transaction],
+            )
 
-        with firefly_iii_client.ApiClient(firefly_configuration) as api_client:
-            api_instance = firefly_iii_client.TransactionsApi(api_client)
             api_response = api_instance.store_transaction(transaction_store)
 
-        print("sent")
+            print("sent")